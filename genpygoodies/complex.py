@@ -67,16 +67,18 @@ def i_formater(value, div):
             return "i"
         if value == -1:
             return "-i"
-        return str(value) + "i"
-    return str(round(value * 1000) / 1000) + "i"
+        return f"{value}i"
+    return f"{round(value * 1000) / 1000}i"
 
 
 def style_argand_transparent(axes):
+    black = cs.BLACK
+    transparent = cs.WHITE.with_a(0)
     (
-        axes.background(cs.WHITE.with_a(0))
-        .axis_linestyle(cs.BLACK, line_width=2.5)
-        .division_linestyle(cs.WHITE.with_a(0), line_width=2.5)
-        .text_color(cs.BLACK)
+        axes.background(transparent)
+        .axis_linestyle(black, line_width=2.5)
+        .division_linestyle(transparent, line_width=2.5)
+        .text_color(black)
     )
     axes.with_division_formatters(y_div_formatter=i_formater)
 
@@ -25,6 +25,20 @@ from generativepy.geometry import Circle, Text, Line, Bezier, ParallelMarker
 from generativepy.math import Vector as V
 
 
+def _weight_offset(direction, text_size):
+    """
+    Default offset of an edge weight label. This is a vector of length text_size*0.7, at right angles to the edge
+    direction. It is the same as `V.polar(text_size*0.7, direction.angle - math.radians(90))`, but it rotates the direction
+    vector directly rather than going via its angle.
+    """
+    x, y = direction
+    length = math.hypot(x, y)
+    if not length:
+        return V(0, -text_size*0.7)
+    scale = text_size*0.7/length
+    return V(y*scale, -x*scale)
+
+
 class Vertex:
 
     def __init__(self, position=(0, 0), label="", fgcolor=None, bgcolor=None, lw=None, radius=None,
@@ -90,15 +104,26 @@ class Vertex:
 
         If any of these parameters have been overridden in the constructor, the override values will be used instead.
         """
-        fgcolor = fgcolor if self.fgcolor is None else self.fgcolor
-        bgcolor = bgcolor if self.bgcolor is None else self.bgcolor
-        lw = lw if self.lw is None else self.lw
-        radius = radius if self.radius is None else self.radius
-        font = font if self.font is None else self.font
-        text_size = text_size if self.text_size is None else self.text_size
+        fgcolor, bgcolor, radius, lw, font, text_size = self.resolve_style(fgcolor, bgcolor, radius, lw, font, text_size)
         Circle(ctx).of_center_radius(self.position, radius).fill(bgcolor).stroke(fgcolor, lw)
         Text(ctx).of(self.label, self.position).align(CENTER, MIDDLE).font(font).size(text_size).fill(fgcolor)
 
+    def resolve_style(self, fgcolor, bgcolor, radius, lw, font, text_size):
+        """
+        Get the style that will be used to draw the vertex. The parameters are the default values, usually from the parent
+        `Graph`. Any of the values that have been overridden in the constructor are replaced by the override value.
+
+        **Returns**
+
+        A tuple (fgcolor, bgcolor, radius, lw, font, text_size).
+        """
+        return (fgcolor if self.fgcolor is None else self.fgcolor,
+                bgcolor if self.bgcolor is None else self.bgcolor,
+                radius if self.radius is None else self.radius,
+                lw if self.lw is None else self.lw,
+                font if self.font is None else self.font,
+                text_size if self.text_size is None else self.text_size)
+
 
 class Edge:
 
@@ -201,14 +226,18 @@ class Edge:
         p0 = V(vertices[self.start].position)
         p1 = V(vertices[self.end].position)
         if self.start == self.end: # Loop
-            c = p0 + V.polar(vertex_radius + self.loop_radius*0.8, self.loop_angle)
+            # Unit vector pointing out from the vertex towards the loop. The loop centre, apex and tangent direction are
+            # all multiples of this vector (or of it rotated by 90 degrees), so only one cos/sin pair is needed.
+            ux, uy = math.cos(self.loop_angle), math.sin(self.loop_angle)
+            distance = vertex_radius + self.loop_radius*0.8
+            c = p0 + V(ux*distance, uy*distance)
             Circle(ctx).of_center_radius(c, self.loop_radius).stroke(color, lw)
-            apex = c + V.polar(self.loop_radius, self.loop_angle)
-            direction = V.polar(self.loop_radius, self.loop_angle+math.radians(90))
+            apex = c + V(ux*self.loop_radius, uy*self.loop_radius)
+            direction = V(-uy*self.loop_radius, ux*self.loop_radius)
             if self.directed:
                 ParallelMarker(ctx).of_start_end(apex-direction, apex+direction).with_length(lw*4).stroke(color, lw)
             if self.weight is not None:
-                offset = V.polar(text_size*0.7, direction.angle - math.radians(90)) if self.offset is None else V(self.offset)
+                offset = _weight_offset(direction, text_size) if self.offset is None else V(self.offset)
                 Text(ctx).of(str(self.weight), apex).align(CENTER, MIDDLE).size(text_size).offset(*offset).font(font).fill(color)
         elif not self.curve: # Straight edge
             direction = p1 - p0
@@ -216,7 +245,7 @@ class Edge:
             if self.directed:
                 ParallelMarker(ctx).of_start_end(vertices[self.start].position, vertices[self.end].position).with_length(lw*4).stroke(color, lw)
             if self.weight is not None:
-                offset = V.polar(text_size*0.7, direction.angle - math.radians(90)) if self.offset is None else V(self.offset)
+                offset = _weight_offset(direction, text_size) if self.offset is None else V(self.offset)
                 Text(ctx).of(str(self.weight), (p0+p1)/2).align(CENTER, MIDDLE).size(text_size).offset(*offset).font(font).fill(color)
         else: # Curved edge
             direction = p1 - p0
@@ -224,16 +253,17 @@ class Edge:
             if self.directed:
                 ParallelMarker(ctx).of_start_end(apex - direction, apex + direction).with_length(lw * 4).stroke(color, lw)
             if self.weight is not None:
-                offset = V.polar(text_size*0.7, direction.angle - math.radians(90)) if self.offset is None else V(self.offset)
+                offset = _weight_offset(direction, text_size) if self.offset is None else V(self.offset)
                 Text(ctx).of(str(self.weight), apex).align(CENTER, MIDDLE).size(text_size).offset(*offset).font(font).fill(color)
 
     def arc_between_points(self, ctx, p0, p1, color, lw):
         """
         Helper method for drawing an arc between two points.
         """
-        x, y = p1 - p0
-        a = (p1 - p0).angle - math.radians(90)
-        l = (p1 - p0).length
+        d = p1 - p0
+        x, y = d
+        a = d.angle - math.radians(90)
+        l = d.length
         radius = l/(1.2*self.curvature)
         b = math.asin(l/(2*radius))
         h = radius*math.cos(b)
@@ -304,6 +334,22 @@ class Graph:
         if isinstance(item, Edge):
             self.edges.append(item)
 
+    def add_vertices(self, items, **style):
+        """
+        Add several vertices to the graph.
+
+        **Parameters**
+
+        * `items`: sequence of ((number, number), str) - the position and label of each vertex.
+        * `style`: optional keyword arguments - any of the `Vertex` style overrides (fgcolor, bgcolor, lw, radius, font,
+          text_size). These are applied to every vertex added.
+
+        **Returns**
+
+        None
+        """
+        self.vertices.extend(Vertex(position, label, **style) for position, label in items)
+
     def draw(self, ctx):
         """
         Draw the complete graph to the drawing context. Call this method after creating the `Graph` and adding the
@@ -38,6 +38,8 @@ class Symbol(ABC):
         self.strokeparams = StrokeParameters()
         self.fillparams = FillParameters()
         self._connectors = ()
+        self._connector_cache = {}
+        self._connector_cache_position = None
 
     def fillstyle(self, pattern=None, fill_rule=None):
         """
@@ -102,11 +104,19 @@ class Symbol(ABC):
 
         A Vector giving the position of the requestd connector. This will be specified relative to the user space that the symbol was created for.
         """
-        if col < 0 or col >= len(self._connectors):
-            raise ValueError("Connector column out of range")
-        if row < 0 or row >= len(self._connectors[col]):
-            raise ValueError("Connector row out of range")
-        return V(self._connectors[col][row]) + self.position
+        # Connector positions are cached, the cache is cleared if the symbol is moved
+        if self.position is not self._connector_cache_position:
+            self._connector_cache = {}
+            self._connector_cache_position = self.position
+        connector = self._connector_cache.get((col, row))
+        if connector is None:
+            if col < 0 or col >= len(self._connectors):
+                raise ValueError("Connector column out of range")
+            if row < 0 or row >= len(self._connectors[col]):
+                raise ValueError("Connector row out of range")
+            connector = V(self._connectors[col][row]) + self.position
+            self._connector_cache[(col, row)] = connector
+        return connector
 
     @abstractmethod
     def label_pos(self):
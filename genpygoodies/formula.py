@@ -8,8 +8,37 @@ specific locations.
 
 The code converts a formula from Latex to a PNG image that is then rendered as an image. The conversion is relatively
 time-consuming (typically it takes a few seconds). When making movies is best to avoid creating formulas per frame, if
-possible. It is better to create a formula image just once outside the draw function.
+possible. It is better to create each formula object just once outside the draw function.
+
+The formula objects don't run Latex when they are created. The image is created the first time the formula is shown,
+which is inside the draw function of the first frame that shows it. To create the images up front instead, call
+`precompile_formulas` with the formulas before making the movie, or read the `image` or `size` attribute of each formula
+object.
+
+To help with this, every formula image is cached in a `latex_cache` folder in the current working directory. If the
+same formula is requested again, with the same colour, dpi and packages, the cached image is used and Latex is not run.
+The cache is saved when the program exits, so it is also reused by later runs, unless genpygoodies, generativepy or
+Latex has changed. `precompile_formulas` can be used to add several formulas to the cache with a single Latex run.
+
+The Latex preamble (document class and packages) is precompiled into a format file in the `latex_cache` folder, which
+saves Latex from loading the packages each time it is run.
+
+`make_formulas_png` can also cache the complete image it creates, so repeating a call with the same parameters just
+copies the previous result. This is off unless the `GENPYGOODIES_FORMULA_OUTPUT_CACHE` environment variable is set. Set
+`GENPYGOODIES_NO_FORMULA_CACHE` to ignore everything in the cache and recreate the images.
 """
+import atexit
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import subprocess
+import uuid
+from pathlib import Path
+
+import numpy as np
+from PIL import Image as PILImage
 from generativepy.color import Color
 from generativepy.drawing import setup, make_image
 from generativepy.formulas import rasterise_formula
@@ -18,6 +47,455 @@ from generativepy.geometry import Image
 
 _FORMULA_INDEX = 0 # Global index used to create temp filenames for formulas. Increment after each use
 
+_OUTPUT_CACHE_ENV = "GENPYGOODIES_FORMULA_OUTPUT_CACHE" # Set this to cache the images created by make_formulas_png
+_NO_CACHE_ENV = "GENPYGOODIES_NO_FORMULA_CACHE" # Set this to ignore all previously cached formula images
+_CACHE_VERSION = None # Fingerprint of the code and tools that create cached images, see _cache_version
+
+
+def _temp_name():
+    """
+    A new base name for Latex intermediate files in the current working directory. The name includes the process id and
+    a random suffix, so that processes sharing a working directory can't overwrite each other's files.
+    """
+    global _FORMULA_INDEX
+    name = "formula{}-{}-{}".format(_FORMULA_INDEX, os.getpid(), uuid.uuid4().hex[:8])
+    _FORMULA_INDEX += 1
+    return name
+
+
+def _remove_file(filename):
+    """
+    Remove a file, ignoring errors. Failing to delete a temporary file isn't a reason to fail.
+    """
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+def _crop_formula(page_file, out_file, color):
+    """
+    Crop a page image created by dvipng to the formula, and colour it in a flat colour. The page is black on white, and
+    the darkness of each pixel becomes the alpha value of the output. The image and size are the same as generativepy
+    `rasterise_formula` creates.
+
+    Returns a tuple of out_file and the (width, height) of the formula.
+    """
+    with PILImage.open(page_file) as page:
+        alpha = 255 - np.asarray(page.convert("RGB"))[:, :, 0]
+
+    rows = np.flatnonzero(alpha.max(axis=1))
+    columns = np.flatnonzero(alpha.max(axis=0))
+    if len(rows) and len(columns):
+        alpha = alpha[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+        # generativepy measures the size between the first and last pixels, so it is one less than the image size
+        size = (int(columns[-1] - columns[0]), int(rows[-1] - rows[0]))
+    else:
+        # An empty page isn't cropped, and its size is given as (rows, columns), again as generativepy does
+        size = alpha.shape[0:2]
+
+    image_data = np.empty(alpha.shape + (4,), dtype=np.uint8)
+    image_data[:, :, 0:3] = np.array((color.r*255, color.g*255, color.b*255)).astype(np.uint8)
+    image_data[:, :, 3] = alpha
+    PILImage.fromarray(image_data).save(out_file)
+    return out_file, size
+
+
+def _latex_cache_dir():
+    """
+    The `latex_cache` folder in the current working directory. This is found each time it is used, rather than when the
+    module is imported, so that the cache is always on the same file system as the Latex intermediate files.
+    """
+    return Path.cwd() / "latex_cache"
+
+
+def _is_current(entry):
+    """
+    Check that a cache entry still refers to the image file that was created for it.
+    """
+    image, size, mtime = entry
+    try:
+        return os.path.getmtime(image) == mtime
+    except OSError:
+        return False
+
+
+def _cache_version():
+    """
+    A fingerprint of this module's source, the installed generativepy version and the latex version, so that images cached
+    by a different version of the code or tools are not reused.
+    """
+    global _CACHE_VERSION
+    if _CACHE_VERSION is None:
+        try:
+            generativepy_version = importlib.metadata.version("generativepy")
+        except importlib.metadata.PackageNotFoundError:
+            generativepy_version = None
+        source = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=20).hexdigest()
+        _CACHE_VERSION = [source, generativepy_version, _tex_version()]
+    return _CACHE_VERSION
+
+
+def _load_formula_cache(cache_dir):
+    """
+    Load the formula cache saved by a previous run. Entries whose image file has been deleted or changed are dropped, and
+    the whole cache is ignored if it was saved by a different version of the code or tools.
+
+    The cache file is JSON, an object with the `version` that saved it and a list of
+    [formula, rgba, dpi, packages, image file, size, mtime] `entries`.
+    """
+    try:
+        with open(cache_dir / "formulas.json") as cache_file:
+            data = json.load(cache_file)
+        if data["version"] != _cache_version():
+            return {}
+        cache = {(formula, tuple(rgba), dpi, tuple(packages)): (image, tuple(size), mtime)
+                 for formula, rgba, dpi, packages, image, size, mtime in data["entries"]}
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+    return {key: entry for key, entry in cache.items() if _is_current(entry)}
+
+
+def _save_formula_caches():
+    """
+    Save the formula caches so that they can be reused by later runs. Called automatically on exit.
+    """
+    for cache_dir, cache in _FORMULA_CACHES.items():
+        if not cache:
+            continue
+        entries = [[formula, rgba, dpi, packages, image, size, mtime]
+                   for (formula, rgba, dpi, packages), (image, size, mtime) in cache.items()]
+        temp_file = cache_dir / "formulas-{}.json".format(os.getpid())
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            with open(temp_file, "w") as cache_file:
+                json.dump({"version": _cache_version(), "entries": entries}, cache_file)
+            os.replace(temp_file, cache_dir / "formulas.json")
+        except OSError:
+            pass
+
+
+_FORMULA_CACHES = {} # Maps each latex_cache folder to its cache of (formula, rgba, dpi, packages) -> (image file, size, mtime)
+atexit.register(_save_formula_caches)
+
+
+def _formula_cache():
+    """
+    The formula cache for the current `latex_cache` folder, loaded from disk when it is first used.
+    """
+    cache_dir = _latex_cache_dir()
+    if cache_dir not in _FORMULA_CACHES:
+        _FORMULA_CACHES[cache_dir] = _load_formula_cache(cache_dir)
+    return _FORMULA_CACHES[cache_dir]
+
+
+def _formula_key(formula, color, dpi, packages):
+    return formula, color.rgba, dpi, tuple(packages) if packages else ()
+
+
+def _cached_formula(key):
+    """
+    Return the (image file, size) tuple for a cache key, or None if the formula isn't cached.
+    """
+    if os.environ.get(_NO_CACHE_ENV):
+        return None
+    entry = _formula_cache().get(key)
+    if entry is not None and _is_current(entry):
+        return entry[0], entry[1]
+    return None
+
+
+def _cache_name(key):
+    """
+    Name (without extension) of the cached image for a key. The name is based on a hash of the key so that the image can't
+    be overwritten by a different formula.
+    """
+    cache_dir = _latex_cache_dir()
+    cache_dir.mkdir(exist_ok=True)
+    return str(cache_dir / hashlib.sha1(repr(key).encode()).hexdigest())
+
+
+def _add_to_cache(key, image, size):
+    size = (int(size[0]), int(size[1]))
+    _formula_cache()[key] = (image, size, os.path.getmtime(image))
+    return image, size
+
+
+def _create_preamble(packages):
+    """
+    Create the latex preamble for a set of packages.
+    Return latex string
+    """
+    tex_elements = [r'\documentclass{article}\pagestyle{empty}', r'\usepackage{amsmath}']
+    tex_elements += [r'\usepackage{' + package + '}' for package in packages]
+    return "\n".join(tex_elements)
+
+
+def _create_body(formulas):
+    """
+    Create the latex document body, containing each formula on a separate page.
+    Return latex string
+    """
+    tex_elements = [r'\begin{document}']
+    tex_elements += [r'\newpage'.join(r'\begin{equation*}' + '\n' + formula + '\n' + r'\end{equation*}' for formula in formulas)]
+    tex_elements += [r'\end{document}']
+    return "\n".join(tex_elements)
+
+
+_PREAMBLE_FORMATS = {} # Maps (latex_cache folder, packages) to the precompiled preamble format, or None if it can't be built
+_TEX_VERSION = None # First line of `latex --version`, see _tex_version
+
+
+def _tex_version():
+    """
+    The version of latex that is installed, used to check that a format file was built by the same version.
+    """
+    global _TEX_VERSION
+    if _TEX_VERSION is None:
+        try:
+            result = subprocess.run(['latex', '--version'], capture_output=True, text=True)
+            _TEX_VERSION = result.stdout.partition('\n')[0]
+        except OSError:
+            _TEX_VERSION = ""
+    return _TEX_VERSION
+
+
+def _build_preamble_fmt(cache_dir, job, packages):
+    """
+    Build the format file job.fmt in cache_dir. Latex writes the format under a temporary job name, which is then moved into
+    place, so another process can't load a partly written format.
+    """
+    temp_job = '{}-{}'.format(job, os.getpid())
+    with open(cache_dir / (temp_job + ".tex"), 'w') as tex_file:
+        tex_file.write(_create_preamble(packages))
+    try:
+        subprocess.run(['latex', '-ini', '-interaction=batchmode', '-jobname=' + temp_job, '&latex ' + temp_job + r'.tex\dump'],
+                       cwd=cache_dir, stdout=subprocess.DEVNULL)
+        os.replace(cache_dir / (temp_job + ".fmt"), cache_dir / (job + ".fmt"))
+    except OSError:
+        pass
+    for ext in ('tex', 'log'):
+        _remove_file(str(cache_dir / '{}.{}'.format(temp_job, ext)))
+
+
+def _ensure_preamble_fmt(packages):
+    """
+    Build a latex format file containing the preamble for a set of packages, so that latex doesn't need to load the
+    document class and packages every time it runs. The format is built in the `latex_cache` folder, once for each set of
+    packages.
+
+    A stamp file next to the format records the job name and the latex version that built it. If the stamp doesn't match,
+    for example because latex has been upgraded, the format is built again.
+
+    Returns the path of the format file without the .fmt extension, or None if the format couldn't be built.
+    """
+    cache_dir = _latex_cache_dir()
+    if (cache_dir, packages) not in _PREAMBLE_FORMATS:
+        job = "preamble-" + hashlib.sha1(repr(packages).encode()).hexdigest()
+        fmt_file = cache_dir / (job + ".fmt")
+        stamp_file = cache_dir / (job + ".stamp")
+        stamp = job + "\n" + _tex_version()
+        try:
+            current = fmt_file.exists() and stamp_file.read_text() == stamp
+        except OSError:
+            current = False
+        if not current:
+            cache_dir.mkdir(exist_ok=True)
+            _remove_file(str(fmt_file))
+            _build_preamble_fmt(cache_dir, job, packages)
+            if fmt_file.exists():
+                stamp_file.write_text(stamp)
+        _PREAMBLE_FORMATS[(cache_dir, packages)] = str(cache_dir / job) if fmt_file.exists() else None
+    return _PREAMBLE_FORMATS[(cache_dir, packages)]
+
+
+def _discard_preamble_fmt(fmt, packages):
+    """
+    Delete a format file that latex can't load, so that it is built again by the next run. The full preamble is used for
+    the rest of this run.
+    """
+    _remove_file(fmt + ".fmt")
+    _remove_file(fmt + ".stamp")
+    _PREAMBLE_FORMATS[(_latex_cache_dir(), packages)] = None
+
+
+def _compile(name, formulas, packages):
+    """
+    Run latex on a document containing the formulas, one per page, creating name.dvi. The precompiled preamble is used if
+    it is available, otherwise the preamble is included in the document.
+
+    If latex fails with the precompiled preamble, it is run again with the full preamble. If that works, the format file
+    was to blame and it is discarded. If it fails too, the formulas are to blame and the format is kept.
+
+    Returns True if name.dvi was created.
+    """
+    fmt = _ensure_preamble_fmt(packages)
+    tex_fn = '{}.tex'.format(name)
+    dvi_file = Path('{}.dvi'.format(name))
+    _remove_file(str(dvi_file))
+    if fmt is not None:
+        with open(tex_fn, 'w') as tex_file:
+            tex_file.write(_create_body(formulas))
+        subprocess.run(['latex', '-fmt=' + fmt, '-interaction=batchmode', tex_fn], stdout=subprocess.DEVNULL)
+        if dvi_file.exists():
+            return True
+
+    with open(tex_fn, 'w') as tex_file:
+        tex_file.write(_create_preamble(packages) + "\n" + _create_body(formulas))
+    subprocess.run(['latex', '-interaction=batchmode', tex_fn], stdout=subprocess.DEVNULL)
+    if not dvi_file.exists():
+        return False
+    if fmt is not None:
+        _discard_preamble_fmt(fmt, packages)
+    return True
+
+
+def _remove_latex_files(name):
+    for ext in ('aux', 'log', 'tex', 'dvi'):
+        _remove_file('{}.{}'.format(name, ext))
+
+
+def _rasterise_formula_fast(name, formula, color, dpi, packages):
+    """
+    Does the same job as generativepy `rasterise_formula`, but uses the precompiled preamble to make latex start faster.
+    Falls back to `rasterise_formula` if the preamble format can't be built. Raises ValueError if latex can't compile the
+    formula.
+    """
+    if _ensure_preamble_fmt(packages) is None:
+        return rasterise_formula(name, formula, color, dpi=dpi, packages=packages)
+
+    if not _compile(name, [formula], packages):
+        _remove_latex_files(name)
+        raise ValueError("Latex could not compile formula {!r}".format(formula))
+
+    subprocess.run(['dvipng', '-T', 'tight', '-D', str(dpi), '--truecolor', '{}.dvi'.format(name)], stdout=subprocess.DEVNULL)
+    filename, size = _crop_formula('{}1.png'.format(name), '{}.png'.format(name), color)
+    _remove_latex_files(name)
+    _remove_file('{}1.png'.format(name))
+    return filename, size
+
+
+def _rasterise_cached(formula, color, dpi=600, packages=None):
+    """
+    Rasterise a formula, reusing the cached image if the same formula has been rasterised before.
+
+    **Parameters**
+
+    * `formula`: str - Latex formula
+    * `color`: Color - Colour of formula.
+    * `dpi`: number - Controls formula size. See formula module of generativepy documentation.
+    * `packages`: sequence of str - list of names of Latex packages the `formula` uses.
+
+    **Returns**
+
+    A tuple containing the filename of the PNG image and its (width, height), as for `rasterise_formula`.
+    """
+    key = _formula_key(formula, color, dpi, packages)
+    cached = _cached_formula(key)
+    if cached is not None:
+        return cached
+
+    image, size = _rasterise_formula_fast(_temp_name(), formula, color, dpi, key[3])
+    cached_image = _cache_name(key) + ".png"
+    os.replace(image, cached_image)
+    return _add_to_cache(key, cached_image, size)
+
+
+def _rasterise_pages(name, keys, colors, dpi, packages):
+    """
+    Rasterise several formulas that share the same dpi and packages, using a single Latex run, and add them to the cache.
+    """
+    if not _compile(name, [key[0] for key in keys], packages):
+        _remove_latex_files(name)
+        return
+    subprocess.run(['dvipng', '-T', 'tight', '-D', str(dpi), '--truecolor', '{}.dvi'.format(name)], stdout=subprocess.DEVNULL)
+
+    # dvipng writes one file per page, name1.png, name2.png etc. If any formula failed the pages won't line up with the
+    # keys, so nothing is cached and the formulas will be rasterised individually when they are used.
+    pages = ['{}{}.png'.format(name, i + 1) for i in range(len(keys))]
+    if all(Path(page).exists() for page in pages) and not Path('{}{}.png'.format(name, len(keys) + 1)).exists():
+        for i, (key, color, page) in enumerate(zip(keys, colors, pages)):
+            # Crop to a temporary file and then move it into the cache, so the cached image is never partly written
+            image, size = _crop_formula(page, '{}-{}.png'.format(name, i), color)
+            cached_image = _cache_name(key) + ".png"
+            os.replace(image, cached_image)
+            _add_to_cache(key, cached_image, size)
+
+    _remove_latex_files(name)
+    for i in range(len(keys) + 1):
+        _remove_file('{}{}.png'.format(name, i + 1))
+
+
+def precompile_formulas(specs):
+    """
+    Rasterise a list of formulas in advance, running Latex once rather than once per formula.
+
+    **Parameters**
+
+    * `specs`: sequence of tuples - each tuple is `(formula, color, dpi, packages)`, the same values that would be passed
+      to `formula_zoom_in`, `formula_fade_in` or `make_formulas_png`. `packages` can be None.
+
+    **Returns**
+
+    None
+
+    **Usage**
+    Starting Latex takes a large part of the time needed to create a formula. If a scene uses several formulas, call this
+    function with all of them before creating the formula objects. The images are added to the formula cache, so the
+    formula objects will use them without running Latex again.
+
+    Formulas that are already cached are skipped. A separate Latex run is needed for each different combination of `dpi`
+    and `packages`.
+    """
+    groups = {}
+    for formula, color, dpi, packages in specs:
+        key = _formula_key(formula, color, dpi, packages)
+        if _cached_formula(key) is None:
+            groups.setdefault((dpi, key[3]), {})[key] = color
+
+    for (dpi, packages), pending in groups.items():
+        _rasterise_pages(_temp_name(), list(pending.keys()), list(pending.values()), dpi, packages)
+
+
+def _output_cache_path(formulas, color, dpi, gap, background, packages):
+    """
+    Path (without extension) of the cached `make_formulas_png` output for a set of parameters. The name is a hash of all
+    the parameters that affect the image, and the version of the code that draws it.
+    """
+    key = (tuple(formulas), color.rgba, dpi, gap, background.rgba if background is not None else None,
+           tuple(packages) if packages else (), tuple(_cache_version()))
+    return _latex_cache_dir() / "output" / hashlib.blake2b(repr(key).encode(), digest_size=20).hexdigest()
+
+
+def _read_output_cache(cache_path, outfile):
+    """
+    If there is a cached image at cache_path, copy it to outfile and return its (width, height). Otherwise return None.
+    """
+    if os.environ.get(_NO_CACHE_ENV):
+        return None
+    try:
+        with open(cache_path.with_suffix(".json")) as size_file:
+            width, height = json.load(size_file)
+        shutil.copyfile(cache_path.with_suffix(".png"), outfile)
+    except (OSError, ValueError):
+        return None
+    return width, height
+
+
+def _write_output_cache(cache_path, outfile, width, height):
+    """
+    Store a copy of a `make_formulas_png` image, and its size, in the output cache. The size file is written last, so
+    an entry is only used if the image was copied completely.
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(outfile, cache_path.with_suffix(".png"))
+        with open(cache_path.with_suffix(".json"), "w") as size_file:
+            json.dump([width, height], size_file)
+    except OSError:
+        pass
+
+
 def make_formulas_png(filepath, formulas, color, dpi=600, gap=50, background=Color(1), packages=None):
     """
     Create a PNG image of a list of latex formulas.
@@ -37,13 +515,26 @@ def make_formulas_png(filepath, formulas, color, dpi=600, gap=50, background=Col
 
     A tuple (width, height) indicating the pixel size of the final image.
 
+    **Usage**
+
+    Set the environment variable `GENPYGOODIES_FORMULA_OUTPUT_CACHE` to a non-empty value to also cache the final image,
+    in the `latex_cache/output` folder. If `make_formulas_png` is then called again with the same parameters, even in a
+    later run, the cached image is copied to `filepath` without running Latex or drawing the image. The cache is only
+    reused by the same version of genpygoodies, generativepy and latex.
+
+    Set the environment variable `GENPYGOODIES_NO_FORMULA_CACHE` to a non-empty value to ignore all cached images, both
+    the final images and the individual formula images. They will be recreated and the caches updated.
     """
-    global _FORMULA_INDEX
-    formula_count = len(formulas)
-    names = ["formula" + str(_FORMULA_INDEX + i) for i in range(formula_count)]
-    _FORMULA_INDEX += formula_count
+    use_cache = bool(os.environ.get(_OUTPUT_CACHE_ENV))
+    if use_cache:
+        outfile = filepath if filepath.lower().endswith('.png') else filepath + '.png'
+        cache_path = _output_cache_path(formulas, color, dpi, gap, background, packages)
+        cached_size = _read_output_cache(cache_path, outfile)
+        if cached_size is not None:
+            return cached_size
 
-    images, sizes = zip(*[rasterise_formula(name, formula, color, dpi=dpi, packages=packages) for name, formula in zip(names, formulas)])
+    formula_count = len(formulas)
+    images, sizes = zip(*[_rasterise_cached(formula, color, dpi=dpi, packages=packages) for formula in formulas])
 
     height = sum([size[1] for size in sizes]) + (formula_count + 1)*gap
     width = max([size[0] for size in sizes]) + 2*gap
@@ -57,11 +548,53 @@ def make_formulas_png(filepath, formulas, color, dpi=600, gap=50, background=Col
             ypos += size[1] + gap
 
     make_image(filepath, draw, width, height)
+    if use_cache:
+        _write_output_cache(cache_path, outfile, width, height)
     return width, height
 
 
+class _LazyFormula():
+    """
+    Base class for formula objects. The formula image isn't created until it is first needed, so a formula that is never
+    shown doesn't run Latex at all.
+    """
+
+    def _set_formula(self, formula, color, dpi, packages):
+        self._spec = (formula, color, dpi, packages)
+        self._image = None
+        self._size = None
+
+    def _ensure_image(self):
+        if self._image is None:
+            self._image, self._size = _rasterise_cached(*self._spec)
+
+    @property
+    def image(self):
+        """
+        The filename of the formula image. Reading this creates the image if necessary. If the image is set directly,
+        `size` should be set to match.
+        """
+        self._ensure_image()
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        self._image = image
+
+    @property
+    def size(self):
+        """
+        The (width, height) of the formula image. Reading this creates the image if necessary.
+        """
+        self._ensure_image()
+        return self._size
 
-class formula_zoom_in():
+    @size.setter
+    def size(self, size):
+        self._size = size
+
+
+class formula_zoom_in(_LazyFormula):
 
     def __init__(self, formula, position, color, appear_time=0, scale_duration=1, initial_scale=0.7, dpi=600, disappear_time=None, fade_duration=1, packages=[]):
         """
@@ -90,11 +623,10 @@ class formula_zoom_in():
         parameters.
 
         Fading is not currently implemented. The formula will behave as if the `fade_duration` is zero.
+
+        The formula image is created when it is first shown, rather than when the object is created.
         """
-        global _FORMULA_INDEX
-        name = "formula" + str(_FORMULA_INDEX)
-        _FORMULA_INDEX += 1
-        self.image, self.size = rasterise_formula(name, formula, color, dpi=dpi, packages=packages)
+        self._set_formula(formula, color, dpi, packages)
         self.position = position
         self.scale = Tween(initial_scale).wait(appear_time).to_d(1, scale_duration)
         self.alpha = Tween(0).wait(appear_time).set(1)
@@ -138,10 +670,15 @@ class formula_zoom_in():
         **Usage**
         Call this in the draw function of every frame where the formula should appear.
         """
-        if self.alpha[fn]:
-            Image(ctx).of_file_position(self.image, (self.position[0] - self.size[0] * self.scale[fn] / 2, self.position[1] - self.size[1] * self.scale[fn] / 2)).scale(self.scale[fn]).paint()
+        if not self.alpha[fn]:
+            return
+        self._ensure_image()
+        scale = self.scale[fn]
+        x, y = self.position
+        width, height = self._size
+        Image(ctx).of_file_position(self._image, (x - width * scale / 2, y - height * scale / 2)).scale(scale).paint()
 
-class formula_fade_in():
+class formula_fade_in(_LazyFormula):
 
     def __init__(self, formula, position, color, appear_time=0, appear_duration=1, dpi=600, disappear_time=None, fade_duration=1):
         """
@@ -170,11 +707,10 @@ class formula_fade_in():
         This class displays a formula that fades in at a certain time. It is best to have an understanding of the generativepy
         formula module before attempting to use this class. It will explain important details such as the `dpi` and `packages`
         parameters.
+
+        The formula image is created when it is first shown, rather than when the object is created.
         """
-        global _FORMULA_INDEX
-        name = "formula" + str(_FORMULA_INDEX)
-        _FORMULA_INDEX += 1
-        self.image, self.size = rasterise_formula(name, formula, color, dpi=dpi)
+        self._set_formula(formula, color, dpi, None)
         self.position = position
         self.alpha = Tween(0).wait(appear_time).to_d(1, appear_duration)
         if disappear_time is not None:
@@ -217,8 +753,8 @@ class formula_fade_in():
         **Usage**
         Call this in the draw function of every frame where the formula should appear.
         """
-        # if self.alpha[fn]:
-        #     Image(ctx).of_file_position(self.image, self.position)
+        if not self.alpha[fn]:
+            return
         Image(ctx).of_file_position(self.image, self.position)
 
 
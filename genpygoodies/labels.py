@@ -0,0 +1,135 @@
+# Author:  Martin McBride
+# Created: 2026-10-15
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+Helpers for drawing text labels.
+
+`LabelStyle` holds the size, font and colour of a label, so that a style can be created once and used to draw many labels.
+
+`TextBatch` collects several labels that share the same style, and draws them with a single fill operation.
+"""
+
+from generativepy.color import Color
+from generativepy.drawing import LEFT, BASELINE
+from generativepy.geometry import FillParameters, Text
+
+
+class LabelStyle():
+    """
+    The size, font and colour used to draw text labels.
+    """
+
+    def __init__(self, size=None, color=Color(0), font=None, weight=None, slant=None):
+        """
+        Initialise a label style.
+
+        **Parameters**
+
+        * `size`: number - the text size. None for default.
+        * `color`: Color - the text colour.
+        * `font`: str - the font name. None for default.
+        * `weight`: the font weight. None for default.
+        * `slant`: the font slant. None for default.
+        """
+        self.size = size
+        self.color = color
+        self.font = font
+        self.weight = weight
+        self.slant = slant
+
+    def text(self, ctx, text, position, alignx=LEFT, aligny=BASELINE, dx=0, dy=0):
+        """
+        Create a generativepy `Text` object for a label, with this style's size and font. The text isn't drawn.
+
+        **Parameters**
+
+        * `ctx`: drawing context - the context that the label will be drawn on.
+        * `text`: str - the label text.
+        * `position`: (number, number) - the position of the label.
+        * `alignx`: the horizontal alignment, as for generativepy `Text.align`.
+        * `aligny`: the vertical alignment, as for generativepy `Text.align`.
+        * `dx`: number - x offset of the label from `position`.
+        * `dy`: number - y offset of the label from `position`.
+
+        **Returns**
+
+        The `Text` object
+        """
+        return (Text(ctx).of(text, position).font(self.font, self.weight, self.slant).size(self.size)
+                .align(alignx, aligny).offset(dx, dy))
+
+    def render(self, ctx, text, position, alignx=LEFT, aligny=BASELINE, dx=0, dy=0):
+        """
+        Draw a label in this style. The parameters are the same as for `text`.
+
+        **Returns**
+
+        self
+        """
+        self.text(ctx, text, position, alignx, aligny, dx, dy).fill(self.color)
+        return self
+
+
+class TextBatch():
+    """
+    A batch of text labels that share the same size, font and colour.
+    """
+
+    def __init__(self, ctx, size=None, color=Color(0), font=None, weight=None, slant=None):
+        """
+        Initialise an empty batch.
+
+        **Parameters**
+
+        * `ctx`: drawing context - the context that the labels will be drawn on.
+        * `size`: number - the text size. None for default.
+        * `color`: Color - the text colour.
+        * `font`: str - the font name. None for default.
+        * `weight`: the font weight. None for default.
+        * `slant`: the font slant. None for default.
+        """
+        self.ctx = ctx
+        self.style = LabelStyle(size, color, font, weight, slant)
+        self.items = []
+
+    def add(self, text, position, alignx=LEFT, aligny=BASELINE, dx=0, dy=0):
+        """
+        Add a label to the batch. Nothing is drawn until `fill` is called.
+
+        **Parameters**
+
+        * `text`: str - the label text.
+        * `position`: (number, number) - the position of the label.
+        * `alignx`: the horizontal alignment, as for generativepy `Text.align`.
+        * `aligny`: the vertical alignment, as for generativepy `Text.align`.
+        * `dx`: number - x offset of the label from `position`.
+        * `dy`: number - y offset of the label from `position`.
+
+        **Returns**
+
+        self
+        """
+        self.items.append((text, position, alignx, aligny, dx, dy))
+        return self
+
+    def fill(self):
+        """
+        Draw all the labels in the batch, then empty the batch.
+
+        **Returns**
+
+        self
+
+        **Usage**
+
+        The outlines of all the labels are added to a single path, which is filled once. This gives the same result as
+        drawing each label with a separate `Text` object, but avoids a fill operation per label.
+        """
+        self.ctx.new_path()
+        for item in self.items:
+            self.style.text(self.ctx, *item).as_sub_path().add()
+        FillParameters(self.style.color).apply(self.ctx)
+        self.ctx.fill()
+        self.items = []
+        return self
@@ -6,8 +6,6 @@
 The tween module provides some utility functions and classes for creating commonly used `Tween` objects using the
 generativepy Tween class.
 """
-from itertools import cycle
-
 from generativepy.tween import Tween
 
 
@@ -55,8 +53,9 @@ def tween_alpha_on(time, *times, off=0, on=1, fade=0.5):
     ```
     """
     tw = Tween(off).wait(time).to_d(on, fade)
-    for t, v in zip(times, cycle((off, on))):
-        tw.wait(t).to_d(v, fade)
+    values = (off, on)
+    for i, t in enumerate(times):
+        tw.wait(t).to_d(values[i & 1], fade)
     return tw
 
 
@@ -79,8 +78,9 @@ def tween_alpha_off(time, *times, off=0, on=1, fade=0.5):
     A configured `Tween` object.
     """
     tw = Tween(on).wait(time).to_d(off, fade)
-    for t, v in zip(times, cycle((on, off))):
-        tw.wait(t).to_d(v, fade)
+    values = (on, off)
+    for i, t in enumerate(times):
+        tw.wait(t).to_d(values[i & 1], fade)
     return tw
 
 
@@ -3,10 +3,35 @@
 # Copyright (C) 2023, Martin McBride
 # License: MIT
 
+# The test modules are independent, so each module is run in a separate process. The results are printed in module
+# order once all the modules have finished.
+
+import io
 import unittest
-loader = unittest.TestLoader()
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 start_dir = './'
-suite = loader.discover(start_dir)
 
-runner = unittest.TextTestRunner()
-runner.run(suite)
\ No newline at end of file
+
+def run_module(name):
+    loader = unittest.TestLoader()
+    suite = loader.discover(start_dir, pattern=name, top_level_dir=start_dir)
+    stream = io.StringIO()
+    result = unittest.TextTestRunner(stream=stream, buffer=True).run(suite)
+    return stream.getvalue(), result.testsRun, result.wasSuccessful()
+
+
+if __name__ == '__main__':
+    names = sorted(path.name for path in Path(start_dir).glob('test_*_module.py'))
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(run_module, names))
+
+    for name, (output, _, _) in zip(names, results):
+        print(name)
+        print(output)
+
+    total = sum(count for _, count, _ in results)
+    failed = [name for name, (_, _, success) in zip(names, results) if not success]
+    print("Ran {} tests in {} modules".format(total, len(names)))
+    print("FAILED: " + ", ".join(failed) if failed else "OK")
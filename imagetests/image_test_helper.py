@@ -7,8 +7,23 @@ from generativepy.utils import temp_file
 from pathlib import Path
 from PIL import Image
 from PIL import ImageChops
+import cairo
+import genpygoodies
+import hashlib
+import inspect
+import numpy as np
 import os
 
+out_folder_name = 'genpygoodies-test-images'
+ref_folder_name = 'images'
+
+# If this environment variable is set, tests that passed last time are skipped if nothing they depend on has changed
+skip_unchanged_env_name = 'GENPYGOODIES_SKIP_UNCHANGED_IMAGE_TESTS'
+stamp_folder_name = '.image_test_cache'
+
+# Image surfaces reused between tests, keyed by (width, height)
+_surfaces = {}
+
 def compare_images(path1, path2):
     with Image.open(path1) as im1:
         with Image.open(path2) as im2:
@@ -23,22 +38,80 @@ def compare_images(path1, path2):
     return True
 
 
-def run_image_test(name, creator):
+def _package_fingerprint():
+    """
+    Hash of the genpygoodies source files
+    """
+    digest = hashlib.blake2b()
+    for path in sorted(Path(genpygoodies.__file__).parent.rglob('*.py')):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _test_fingerprint(name, function, ref_name):
+    """
+    Fingerprint of everything an image test depends on: the genpygoodies source, the source of the test module and this
+    helper, and the reference image. Changes to generativepy, cairo, or fonts are not detected, which is why skipping
+    unchanged tests is opt-in.
+    :param name: test name (used as the image file name)
+    :param function: the test's draw or creator function
+    :param ref_name: file name of the reference image the test compares against
+    :return: the fingerprint, or None if skipping is not enabled or the fingerprint can't be calculated
+    """
+    if not os.environ.get(skip_unchanged_env_name):
+        return None
+    try:
+        ref_stat = os.stat(os.path.join(ref_folder_name, ref_name))
+        digest = hashlib.blake2b(name.encode())
+        digest.update(Path(inspect.getsourcefile(function)).read_bytes())
+        digest.update(Path(__file__).read_bytes())
+        digest.update(_package_fingerprint().encode())
+        digest.update('{} {}'.format(ref_stat.st_size, ref_stat.st_mtime_ns).encode())
+    except (OSError, TypeError):
+        return None
+    return digest.hexdigest()
+
+
+def _passed_before(name, fingerprint):
+    """
+    Check if the test passed last time it was run with the same fingerprint
+    """
+    if fingerprint is None:
+        return False
+    try:
+        return Path(stamp_folder_name, name + '.stamp').read_text() == fingerprint
+    except OSError:
+        return False
+
+
+def _record_pass(name, fingerprint):
+    """
+    Record that the test passed with the given fingerprint
+    """
+    if fingerprint is not None:
+        Path(stamp_folder_name).mkdir(exist_ok=True)
+        Path(stamp_folder_name, name + '.stamp').write_text(fingerprint)
+
+
+def run_image_test(name, creator, ref_name=None):
     """
     Create an image and check it matches the reference image
     :param name: test name (used as the image file name)
     :param creator: a function that takes a filepath ans creates an image
+    :param ref_name: name of the reference image, if it isn't the same as name
     :return:
     """
+    fingerprint = _test_fingerprint(name, creator, ref_name or name)
+    if _passed_before(name, fingerprint):
+        return True
+
     # Create test output folder
-    out_folder_name = 'genpygoodies-test-images'
-    ref_folder_name = 'images'
     out_folder = temp_file(out_folder_name)
     Path(out_folder).mkdir(exist_ok=True)
 
     # Warn if output file exists, or if reference file doesn't exist
     out_file = temp_file(out_folder_name, name)
-    ref_file = os.path.join(ref_folder_name, name)
+    ref_file = os.path.join(ref_folder_name, ref_name if ref_name else name)
     if Path(out_file).exists():
         print("WARNING temp file {} already exists".format(out_file))
 
@@ -50,4 +123,103 @@ def run_image_test(name, creator):
         print("WARNING reference file {} doesn't exist".format(ref_file))
         return False
 
-    return compare_images(out_file, ref_file)
+    matches = compare_images(out_file, ref_file)
+    if matches:
+        _record_pass(name, fingerprint)
+    return matches
+
+
+def load_reference(name):
+    """
+    Read a reference image into memory
+    :param name: test name (used as the image file name)
+    :return: NumPy array of shape (height, width, 3), or None if the reference file doesn't exist or isn't RGB
+    """
+    ref_file = os.path.join(ref_folder_name, name)
+    if not Path(ref_file).exists():
+        print("WARNING reference file {} doesn't exist".format(ref_file))
+        return None
+    with Image.open(ref_file) as im:
+        if im.mode != 'RGB':
+            return None
+        return np.asarray(im)
+
+
+def load_references(*names):
+    """
+    Read several reference images into memory, for example in a test class setUpClass method
+    :param names: test names (used as the image file names)
+    :return: dictionary mapping each name to the result of load_reference
+    """
+    return {name: load_reference(name) for name in names}
+
+
+def get_surface(width, height):
+    """
+    Get a blank RGB image surface. The tests only use a few different image sizes, so a surface of each size is created
+    the first time it is needed and then cleared and reused for later tests.
+    :param width: image width in pixels
+    :param height: image height in pixels
+    :return: a cairo ImageSurface
+    """
+    surface = _surfaces.get((width, height))
+    if surface is None:
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, width, height)
+        _surfaces[(width, height)] = surface
+    else:
+        ctx = cairo.Context(surface)
+        ctx.set_operator(cairo.OPERATOR_CLEAR)
+        ctx.paint()
+    return surface
+
+
+def make_frame(draw, width, height):
+    """
+    Draw an image in memory. This is equivalent to generativepy make_image_frame, but draws on a reused surface.
+    :param draw: a generativepy draw function
+    :param width: image width in pixels
+    :param height: image height in pixels
+    :return: NumPy array of shape (height, width, 3). This is a copy, so it remains valid when the surface is reused.
+    """
+    surface = get_surface(width, height)
+    draw(cairo.Context(surface), width, height, 0, 1)
+    surface.flush()
+    buf = np.frombuffer(surface.get_data(), np.uint8).reshape(height, width, 4)
+    # Each pixel is stored as 4 bytes, in BGR order with the 4th byte unused
+    return np.ascontiguousarray(buf[:, :, [2, 1, 0]])
+
+
+def run_frame_test(name, draw, width, height, references=None):
+    """
+    Draw an image in memory and check it matches the reference image. This avoids writing the image out as a PNG file
+    and reading it back in. The image is only written to the test output folder if it doesn't match, so that it can be
+    inspected.
+    :param name: test name (used as the image file name)
+    :param draw: a generativepy draw function
+    :param width: image width in pixels
+    :param height: image height in pixels
+    :param references: optional dictionary of reference images created by load_references. If it contains name, that
+    image is used rather than reading the reference file again.
+    :return:
+    """
+    fingerprint = _test_fingerprint(name, draw, name)
+    if _passed_before(name, fingerprint):
+        return True
+
+    frame = make_frame(draw, width, height)
+
+    if references is not None and name in references:
+        reference = references[name]
+    else:
+        reference = load_reference(name)
+
+    # Can't check if reference file not there, so fail the test
+    matches = reference is not None and frame.shape == reference.shape and np.array_equal(frame, reference)
+
+    if matches:
+        _record_pass(name, fingerprint)
+    else:
+        Path(temp_file(out_folder_name)).mkdir(exist_ok=True)
+        # The output image is only for inspection, so use fast compression
+        Image.fromarray(frame).save(temp_file(out_folder_name, name), compress_level=1)
+    return matches
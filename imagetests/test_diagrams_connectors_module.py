@@ -2,17 +2,19 @@ import math
 import unittest
 
 from generativepy.color import Color
-from generativepy.drawing import setup, make_image, CENTER, MIDDLE, RIGHT, BOTTOM, LEFT, TOP, BUTT, ROUND
+from generativepy.drawing import setup, CENTER, MIDDLE, RIGHT, BOTTOM, LEFT, TOP, BUTT, ROUND
 from generativepy.geometry import Line, Text, Circle, FillParameters, StrokeParameters, Transform
 
 from generativepy.math import Vector as V
 
 from genpygoodies.diagrams.connectors import Connector, Connection, ElbowConnector
 from genpygoodies.diagrams.logicgates import Buffer, And, Or, Xor
-from image_test_helper import run_image_test
+from image_test_helper import run_frame_test
 
-green_stroke = StrokeParameters(Color("darkgreen"), 4, cap=ROUND)
-green_fill = FillParameters(Color("darkgreen"))
+white = Color(1)
+dark_green = Color("darkgreen")
+green_stroke = StrokeParameters(dark_green, 4, cap=ROUND)
+green_fill = FillParameters(dark_green)
 
 
 """
@@ -23,7 +25,7 @@ class TestConnectors(unittest.TestCase):
 
     def test_connector_connection(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
+            setup(ctx, width, height, background=white)
 
             a = (100, 200)
             b = (300, 100)
@@ -33,14 +35,11 @@ class TestConnectors(unittest.TestCase):
                 Connection(a, 4).fillstyle(green_fill).draw(ctx)
                 Connection(b, 4).fillstyle(green_fill).draw(ctx)
 
-        def creator(file):
-            make_image(file, draw, 400, 300)
-
-        self.assertTrue(run_image_test('test_connector_connection.png', creator))
+        self.assertTrue(run_frame_test('test_connector_connection.png', draw, 400, 300))
 
     def test_elbow_connector(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
+            setup(ctx, width, height, background=white)
 
             a = (100, 100)
             b = (200, 150)
@@ -48,8 +47,5 @@ class TestConnectors(unittest.TestCase):
             with Transform(ctx).translate(50, 70):
                 ElbowConnector(a, b, 0.9, False).strokestyle(green_stroke).draw(ctx)
 
-        def creator(file):
-            make_image(file, draw, 400, 300)
-
-        self.assertTrue(run_image_test('test_elbow_connector.png', creator))
+        self.assertTrue(run_frame_test('test_elbow_connector.png', draw, 400, 300))
 
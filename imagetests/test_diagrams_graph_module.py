@@ -2,11 +2,47 @@ import math
 import unittest
 
 from generativepy.color import Color
-from generativepy.drawing import setup, make_image
+from generativepy.drawing import setup
 from generativepy.geometry import Transform
 
 from genpygoodies.diagrams.graph import Graph, Vertex, Edge
-from image_test_helper import run_image_test
+from image_test_helper import run_frame_test, load_references
+
+white = Color(1)
+blue = Color("blue")
+light_blue = Color("blue").light1
+light_yellow = Color("yellow").light1
+cyan = Color("cyan")
+light_magenta = Color("magenta").light1
+red = Color("red")
+dark_orange = Color("orange").dark1
+
+loop_angle_120 = math.radians(120)
+loop_angle_270 = math.radians(270)
+loop_angle_minus_135 = math.radians(-135)
+
+# Vertex layouts shared by several tests
+square_vertices = [((100, 100), "A"), ((100, 300), "B"), ((200, 50), "C"), ((300, 200), "D")]
+wide_vertices = [((100, 100), "A"), ((100, 300), "B"), ((200, 50), "C"), ((350, 350), "D")]
+loop_vertices = [((100, 100), "A"), ((100, 300), "B"), ((300, 50), "C"), ((350, 350), "D")]
+
+# Non-default graph style shared by several tests
+large_style = dict(fgcolor=blue, bgcolor=light_yellow, lw=6, radius=40, font="Times New Roman", text_size=40)
+
+
+def build_graph(vertices, edges, **style):
+    """
+    Create a graph
+    :param vertices: list of (position, label) pairs
+    :param edges: list of Edge objects
+    :param style: style parameters passed to the Graph constructor
+    :return: the graph
+    """
+    graph = Graph(**style)
+    graph.add_vertices(vertices)
+    for edge in edges:
+        graph.add(edge)
+    return graph
 
 """
 Test the diagrams.graph module.
@@ -14,246 +50,121 @@ Test the diagrams.graph module.
 
 class TestGraphImages(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.references = load_references('test_default_graph.png',
+                                         'test_color_graph.png',
+                                         'test_curve_graph.png',
+                                         'test_directed_graph.png',
+                                         'test_weighted_graph.png',
+                                         'test_loop_graph.png')
+
     def test_default_graph(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
-
-            graph = Graph()
-            graph.add(Vertex((100, 100), "A"))
-            graph.add(Vertex((100, 300), "B"))
-            graph.add(Vertex((200, 50), "C"))
-            graph.add(Vertex((300, 200), "D"))
-            graph.add(Edge(0, 1))
-            graph.add(Edge(1, 3))
-            graph.add(Edge(2, 0))
-            graph.add(Edge(3, 2))
-            graph.draw(ctx)
-
-            with Transform(ctx).translate(400, 0):
-                graph = Graph()
-                graph.add(Vertex((200, 100), "1"))
-                graph.add(Vertex((300, 250), "2"))
-                graph.add(Vertex((200, 300), "3"))
-                graph.add(Vertex((100, 200), "4"))
-                graph.add(Edge(0, 1))
-                graph.add(Edge(1, 2))
-                graph.add(Edge(2, 3))
-                graph.add(Edge(3, 0))
-                graph.add(Edge(1, 3))
-                graph.add(Edge(0, 2))
-                graph.draw(ctx)
+            setup(ctx, width, height, background=white)
 
-        def creator(file):
-            make_image(file, draw, 800, 400)
-
-        self.assertTrue(run_image_test('test_default_graph.png', creator))
-
-    def test_curve_graph(self):
-        def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
-
-            graph = Graph()
-            graph.add(Vertex((100, 100), "A"))
-            graph.add(Vertex((100, 300), "B"))
-            graph.add(Vertex((200, 50), "C"))
-            graph.add(Vertex((350, 350), "D"))
-            graph.add(Edge(0, 1, curve=True))
-            graph.add(Edge(1, 0))
-            graph.add(Edge(2, 3, curve=True))
-            graph.add(Edge(2, 3))
-            graph.draw(ctx)
+            build_graph(square_vertices, [Edge(0, 1), Edge(1, 3), Edge(2, 0), Edge(3, 2)]).draw(ctx)
 
             with Transform(ctx).translate(400, 0):
-                graph = Graph()
-                graph.add(Vertex((100, 100), "A"))
-                graph.add(Vertex((100, 300), "B"))
-                graph.add(Vertex((200, 50), "C"))
-                graph.add(Vertex((300, 200), "D"))
-                graph.add(Edge(1, 0, curve=True))
-                graph.add(Edge(0, 1, curve=True))
-                graph.add(Edge(0, 2, curve=True))
-                graph.add(Edge(2, 0, curve=True))
-                graph.add(Edge(2, 3, curve=True))
-                graph.add(Edge(3, 1, curve=True))
-                graph.draw(ctx)
-
-        def creator(file):
-            make_image(file, draw, 800, 400)
+                build_graph([((200, 100), "1"), ((300, 250), "2"), ((200, 300), "3"), ((100, 200), "4")],
+                            [Edge(0, 1), Edge(1, 2), Edge(2, 3), Edge(3, 0), Edge(1, 3), Edge(0, 2)]).draw(ctx)
 
-        self.assertTrue(run_image_test('test_curve_graph.png', creator))
+        self.assertTrue(run_frame_test('test_default_graph.png', draw, 800, 400, self.references))
 
     def test_colour_graph(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
-
-            graph = Graph(fgcolor=Color("blue"), bgcolor=Color("yellow").light1, lw=6, radius=40,
-                          font="Times New Roman", text_size=40)
-            graph.add(Vertex((100, 100), "A"))
-            graph.add(Vertex((100, 300), "B"))
-            graph.add(Vertex((200, 50), "C"))
-            graph.add(Vertex((300, 200), "D"))
-            graph.add(Edge(0, 1))
-            graph.add(Edge(1, 3))
-            graph.add(Edge(2, 0))
-            graph.add(Edge(3, 2))
-            graph.draw(ctx)
+            setup(ctx, width, height, background=white)
+
+            build_graph(square_vertices, [Edge(0, 1), Edge(1, 3), Edge(2, 0), Edge(3, 2)], **large_style).draw(ctx)
 
             with Transform(ctx).translate(400, 0):
-                graph = Graph(fgcolor=Color("cyan"), bgcolor=Color("magenta").light1, lw=6, radius=40,
+                graph = Graph(fgcolor=cyan, bgcolor=light_magenta, lw=6, radius=40,
                               font="Times New Roman", text_size=40)
                 graph.add(Vertex((200, 100), "1"))
-                graph.add(Vertex((300, 250), "2", fgcolor=Color("red"), bgcolor=Color("blue").light1, lw=4, radius=20,
+                graph.add(Vertex((300, 250), "2", fgcolor=red, bgcolor=light_blue, lw=4, radius=20,
                               font="Courier", text_size=25))
                 graph.add(Vertex((200, 300), "3"))
                 graph.add(Vertex((100, 200), "4"))
                 graph.add(Edge(0, 1))
                 graph.add(Edge(1, 2))
-                graph.add(Edge(2, 3, color=Color("orange").dark1, lw=10))
+                graph.add(Edge(2, 3, color=dark_orange, lw=10))
                 graph.add(Edge(3, 0))
                 graph.add(Edge(1, 3))
                 graph.add(Edge(0, 2))
                 graph.draw(ctx)
 
-        def creator(file):
-            make_image(file, draw, 800, 400)
-
-        self.assertTrue(run_image_test('test_color_graph.png', creator))
+        self.assertTrue(run_frame_test('test_color_graph.png', draw, 800, 400, self.references))
 
     def test_curve_graph(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
-
-            graph = Graph()
-            graph.add(Vertex((100, 100), "A"))
-            graph.add(Vertex((100, 300), "B"))
-            graph.add(Vertex((200, 50), "C"))
-            graph.add(Vertex((350, 350), "D"))
-            graph.add(Edge(0, 1, curve=True))
-            graph.add(Edge(1, 0))
-            graph.add(Edge(2, 3, curve=True))
-            graph.add(Edge(2, 3))
-            graph.draw(ctx)
+            setup(ctx, width, height, background=white)
 
-            with Transform(ctx).translate(400, 0):
-                graph = Graph()
-                graph.add(Vertex((100, 100), "A"))
-                graph.add(Vertex((100, 300), "B"))
-                graph.add(Vertex((200, 50), "C"))
-                graph.add(Vertex((300, 200), "D"))
-                graph.add(Edge(1, 0, curve=True))
-                graph.add(Edge(0, 1, curve=True))
-                graph.add(Edge(0, 2, curve=True))
-                graph.add(Edge(2, 0, curve=True))
-                graph.add(Edge(2, 3, curve=True))
-                graph.add(Edge(3, 1, curve=True))
-                graph.draw(ctx)
+            build_graph(wide_vertices, [Edge(0, 1, curve=True),
+                                        Edge(1, 0),
+                                        Edge(2, 3, curve=True),
+                                        Edge(2, 3)]).draw(ctx)
 
-        def creator(file):
-            make_image(file, draw, 800, 400)
+            with Transform(ctx).translate(400, 0):
+                build_graph(square_vertices, [Edge(1, 0, curve=True),
+                                              Edge(0, 1, curve=True),
+                                              Edge(0, 2, curve=True),
+                                              Edge(2, 0, curve=True),
+                                              Edge(2, 3, curve=True),
+                                              Edge(3, 1, curve=True)]).draw(ctx)
 
-        self.assertTrue(run_image_test('test_curve_graph.png', creator))
+        self.assertTrue(run_frame_test('test_curve_graph.png', draw, 800, 400, self.references))
 
     def test_directed_graph(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
-
-            graph = Graph()
-            graph.add(Vertex((100, 100), "A"))
-            graph.add(Vertex((100, 300), "B"))
-            graph.add(Vertex((200, 50), "C"))
-            graph.add(Vertex((350, 350), "D"))
-            graph.add(Edge(0, 1, curve=True, directed=True))
-            graph.add(Edge(1, 0, directed=True))
-            graph.add(Edge(2, 3, curve=True))
-            graph.add(Edge(2, 3))
-            graph.draw(ctx)
+            setup(ctx, width, height, background=white)
 
-            with Transform(ctx).translate(400, 0):
-                graph = Graph(fgcolor=Color("blue"), bgcolor=Color("yellow").light1, lw=6, radius=40,
-                              font="Times New Roman", text_size=40)
-                graph.add(Vertex((100, 100), "A"))
-                graph.add(Vertex((100, 300), "B"))
-                graph.add(Vertex((200, 50), "C"))
-                graph.add(Vertex((300, 200), "D"))
-                graph.add(Edge(1, 0, curve=True, directed=True))
-                graph.add(Edge(0, 1, curve=True, directed=True))
-                graph.add(Edge(0, 2, curve=True))
-                graph.add(Edge(2, 0, curve=True))
-                graph.add(Edge(2, 3, curve=True, directed=True))
-                graph.add(Edge(3, 1, curve=True))
-                graph.draw(ctx)
+            build_graph(wide_vertices, [Edge(0, 1, curve=True, directed=True),
+                                        Edge(1, 0, directed=True),
+                                        Edge(2, 3, curve=True),
+                                        Edge(2, 3)]).draw(ctx)
 
-        def creator(file):
-            make_image(file, draw, 800, 400)
+            with Transform(ctx).translate(400, 0):
+                build_graph(square_vertices, [Edge(1, 0, curve=True, directed=True),
+                                              Edge(0, 1, curve=True, directed=True),
+                                              Edge(0, 2, curve=True),
+                                              Edge(2, 0, curve=True),
+                                              Edge(2, 3, curve=True, directed=True),
+                                              Edge(3, 1, curve=True)], **large_style).draw(ctx)
 
-        self.assertTrue(run_image_test('test_directed_graph.png', creator))
+        self.assertTrue(run_frame_test('test_directed_graph.png', draw, 800, 400, self.references))
 
     def test_weighted_graph(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
-
-            graph = Graph()
-            graph.add(Vertex((100, 100), "A"))
-            graph.add(Vertex((100, 300), "B"))
-            graph.add(Vertex((200, 50), "C"))
-            graph.add(Vertex((350, 350), "D"))
-            graph.add(Edge(0, 1, curve=True, weight=1))
-            graph.add(Edge(1, 0, directed=True, weight=2))
-            graph.add(Edge(2, 3, curve=True))
-            graph.add(Edge(2, 3, weight="a"))
-            graph.add(Edge(2, 3, weight="long", offset=(-40, 20)))
-            graph.draw(ctx)
+            setup(ctx, width, height, background=white)
 
-            with Transform(ctx).translate(400, 0):
-                graph = Graph(fgcolor=Color("blue"), bgcolor=Color("yellow").light1, lw=6, radius=40,
-                              font="Times New Roman", text_size=40)
-                graph.add(Vertex((100, 100), "A"))
-                graph.add(Vertex((100, 300), "B"))
-                graph.add(Vertex((200, 50), "C"))
-                graph.add(Vertex((300, 200), "D"))
-                graph.add(Edge(1, 0, curve=True, directed=True, weight="X"))
-                graph.add(Edge(0, 1, curve=True, directed=True, weight="Y"))
-                graph.add(Edge(0, 2, curve=True))
-                graph.add(Edge(2, 0, curve=True))
-                graph.add(Edge(2, 3, curve=True, directed=True))
-                graph.add(Edge(3, 1, curve=True))
-                graph.draw(ctx)
+            build_graph(wide_vertices, [Edge(0, 1, curve=True, weight=1),
+                                        Edge(1, 0, directed=True, weight=2),
+                                        Edge(2, 3, curve=True),
+                                        Edge(2, 3, weight="a"),
+                                        Edge(2, 3, weight="long", offset=(-40, 20))]).draw(ctx)
 
-        def creator(file):
-            make_image(file, draw, 800, 400)
+            with Transform(ctx).translate(400, 0):
+                build_graph(square_vertices, [Edge(1, 0, curve=True, directed=True, weight="X"),
+                                              Edge(0, 1, curve=True, directed=True, weight="Y"),
+                                              Edge(0, 2, curve=True),
+                                              Edge(2, 0, curve=True),
+                                              Edge(2, 3, curve=True, directed=True),
+                                              Edge(3, 1, curve=True)], **large_style).draw(ctx)
 
-        self.assertTrue(run_image_test('test_weighted_graph.png', creator))
+        self.assertTrue(run_frame_test('test_weighted_graph.png', draw, 800, 400, self.references))
 
     def test_loop_graph(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
-
-            graph = Graph()
-            graph.add(Vertex((100, 100), "A"))
-            graph.add(Vertex((100, 300), "B"))
-            graph.add(Vertex((300, 50), "C"))
-            graph.add(Vertex((350, 350), "D"))
-            graph.add(Edge(0, 0))
-            graph.add(Edge(1, 1, loop_angle=math.radians(120), directed=1))
-            graph.add(Edge(1, 1, loop_angle=math.radians(270)))
-            graph.add(Edge(3, 3, loop_angle=math.radians(-135), weight=2))
-            graph.draw(ctx)
+            setup(ctx, width, height, background=white)
 
-            with Transform(ctx).translate(400, 0):
-                graph = Graph(fgcolor=Color("blue"), bgcolor=Color("yellow").light1, lw=6, radius=40,
-                              font="Times New Roman", text_size=40)
-                graph.add(Vertex((100, 100), "A"))
-                graph.add(Vertex((100, 300), "B"))
-                graph.add(Vertex((300, 50), "C"))
-                graph.add(Vertex((350, 350), "D"))
-                graph.add(Edge(0, 0))
-                graph.add(Edge(1, 1, loop_angle=math.radians(120), directed=1))
-                graph.add(Edge(1, 1, loop_angle=math.radians(270)))
-                graph.add(Edge(3, 3, loop_angle=math.radians(-135), weight=2))
-                graph.draw(ctx)
+            loop_edges = [Edge(0, 0),
+                          Edge(1, 1, loop_angle=loop_angle_120, directed=1),
+                          Edge(1, 1, loop_angle=loop_angle_270),
+                          Edge(3, 3, loop_angle=loop_angle_minus_135, weight=2)]
+            build_graph(loop_vertices, loop_edges).draw(ctx)
 
-        def creator(file):
-            make_image(file, draw, 800, 400)
+            with Transform(ctx).translate(400, 0):
+                build_graph(loop_vertices, loop_edges, **large_style).draw(ctx)
 
-        self.assertTrue(run_image_test('test_loop_graph.png', creator))
+        self.assertTrue(run_frame_test('test_loop_graph.png', draw, 800, 400, self.references))
 
@@ -2,205 +2,233 @@ import math
 import unittest
 
 from generativepy.color import Color
-from generativepy.drawing import setup, make_image, CENTER, MIDDLE, RIGHT, BOTTOM, LEFT, TOP, BUTT, ROUND
-from generativepy.geometry import Line, Text, Circle, FillParameters, StrokeParameters
+from generativepy.drawing import setup, CENTER, MIDDLE, RIGHT, BOTTOM, LEFT, TOP, BUTT, ROUND
+from generativepy.geometry import Circle, FillParameters, StrokeParameters
 
 from generativepy.math import Vector as V
 
 from genpygoodies.diagrams.logicgates import Buffer, And, Or, Xor, BoxItem
-from image_test_helper import run_image_test
-
+from genpygoodies.labels import LabelStyle, TextBatch
+from image_test_helper import run_frame_test, load_references
+
+white = Color(1)
+black = Color(0)
+blue = Color("blue")
+green = Color("green")
+yellow = Color("yellow")
+red = Color("red")
 green_stroke = StrokeParameters(Color("darkgreen"), 4, cap=ROUND)
 grey_fill = FillParameters(Color(0.8))
+label_style = LabelStyle(size=20, color=black)
+blue_line = StrokeParameters(blue, 3)
+green_line = StrokeParameters(green, 3)
+black_line = StrokeParameters(black, 3)
+red_line = StrokeParameters(red, 3)
+green_butt_line = StrokeParameters(green, 3, cap=BUTT)
+red_butt_line = StrokeParameters(red, 3, cap=BUTT)
+
+# Offsets used to draw the wires into and out of each gate
+left_30 = V(-30, 0)
+right_30 = V(30, 0)
+right_50 = V(50, 0)
+up_30 = V(0, -30)
+down_30 = V(0, 30)
 
 """
 Test the diagrams.logicgates module.
 """
 
+def draw_lines(ctx, segments, strokeparams):
+    """
+    Stroke several lines with the same style as a single path
+    :param ctx: drawing context
+    :param segments: sequence of (start, end) point pairs
+    :param strokeparams: StrokeParameters used to draw the lines
+    """
+    ctx.new_path()
+    for start, end in segments:
+        ctx.move_to(*start)
+        ctx.line_to(*end)
+    strokeparams.apply(ctx)
+    ctx.stroke()
+
+
 class TestLogicGatesImages(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.references = load_references('test_buffer_gate.png',
+                                         'test_and_gate.png',
+                                         'test_or_gate.png',
+                                         'test_xor_gate.png',
+                                         'test_box_item.png')
+
     def test_buffer_gate(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
+            setup(ctx, width, height, background=white)
 
-            gate = Buffer((100, 100), 50).fillstyle(Color("yellow")).strokestyle(Color("blue"), 3)
+            gate = Buffer((100, 100), 50).fillstyle(yellow).strokestyle(blue_line)
             gate.draw(ctx)
             in_pos = V(gate.get_connector(0, 0))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos, in_pos + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3)
+            draw_lines(ctx, [(in_pos, in_pos + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_line)
 
-            Text(ctx).of("A", in_pos).size(20).align(RIGHT, BOTTOM).offset(-10, -5).fill(Color(0))
-            Text(ctx).of("B", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("X", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            label_style.render(ctx, "A", in_pos, RIGHT, BOTTOM, -10, -5)
+            label_style.render(ctx, "B", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "X", gate.label_pos(), CENTER, MIDDLE)
 
             gate = Buffer((100, 200), 50, invert=True).fillstyle(grey_fill).strokestyle(green_stroke)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3)
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_line)
 
-            Text(ctx).of("C", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-10, -5).fill(Color(0))
-            Text(ctx).of("D", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("Y", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            label_style.render(ctx, "C", in_pos1, RIGHT, BOTTOM, -10, -5)
+            label_style.render(ctx, "D", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "Y", gate.label_pos(), CENTER, MIDDLE)
 
-        def creator(file):
-            make_image(file, draw, 400, 300)
-
-        self.assertTrue(run_image_test('test_buffer_gate.png', creator))
+        self.assertTrue(run_frame_test('test_buffer_gate.png', draw, 400, 300, self.references))
 
     def test_and_gate(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
+            setup(ctx, width, height, background=white)
 
-            gate = And((100, 100), 50).fillstyle(Color("yellow")).strokestyle(Color("blue"), 3)
+            gate = And((100, 100), 50).fillstyle(yellow).strokestyle(blue_line)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3)
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30), (in_pos2, in_pos2 + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_line)
 
-            Text(ctx).of("A", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-10, -5).fill(Color(0))
-            Text(ctx).of("B", in_pos2).size(20).align(RIGHT, TOP).offset(-10, 5).fill(Color(0))
-            Text(ctx).of("C", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("X", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            label_style.render(ctx, "A", in_pos1, RIGHT, BOTTOM, -10, -5)
+            label_style.render(ctx, "B", in_pos2, RIGHT, TOP, -10, 5)
+            label_style.render(ctx, "C", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "X", gate.label_pos(), CENTER, MIDDLE)
 
             gate = And((100, 200), 50, invert=True).fillstyle(grey_fill).strokestyle(green_stroke)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3)
-
-            Text(ctx).of("D", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-10, -5).fill(Color(0))
-            Text(ctx).of("E", in_pos2).size(20).align(RIGHT, TOP).offset(-10, 5).fill(Color(0))
-            Text(ctx).of("F", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("Y", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30), (in_pos2, in_pos2 + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_line)
 
-        def creator(file):
-            make_image(file, draw, 400, 300)
+            label_style.render(ctx, "D", in_pos1, RIGHT, BOTTOM, -10, -5)
+            label_style.render(ctx, "E", in_pos2, RIGHT, TOP, -10, 5)
+            label_style.render(ctx, "F", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "Y", gate.label_pos(), CENTER, MIDDLE)
 
-        self.assertTrue(run_image_test('test_and_gate.png', creator))
+        self.assertTrue(run_frame_test('test_and_gate.png', draw, 400, 300, self.references))
 
     def test_or_gate(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
+            setup(ctx, width, height, background=white)
 
-            gate = Or((100, 100), 50).fillstyle(Color("yellow")).strokestyle(Color("blue"), 3)
+            gate = Or((100, 100), 50).fillstyle(yellow).strokestyle(blue_line)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("red"), 3, cap=BUTT)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("red"), 3, cap=BUTT)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3, cap=BUTT)
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30), (in_pos2, in_pos2 + left_30)], red_butt_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_butt_line)
 
-            Text(ctx).of("A", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-15, -5).fill(Color(0))
-            Text(ctx).of("B", in_pos2).size(20).align(RIGHT, TOP).offset(-15, 5).fill(Color(0))
-            Text(ctx).of("C", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("X", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            label_style.render(ctx, "A", in_pos1, RIGHT, BOTTOM, -15, -5)
+            label_style.render(ctx, "B", in_pos2, RIGHT, TOP, -15, 5)
+            label_style.render(ctx, "C", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "X", gate.label_pos(), CENTER, MIDDLE)
 
             gate = Or((100, 200), 50, invert=True).fillstyle(grey_fill).strokestyle(green_stroke)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("red"), 3, cap=BUTT)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("red"), 3, cap=BUTT)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3, cap=BUTT)
-
-            Text(ctx).of("D", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-15, -5).fill(Color(0))
-            Text(ctx).of("E", in_pos2).size(20).align(RIGHT, TOP).offset(-15, 5).fill(Color(0))
-            Text(ctx).of("F", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("Y", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30), (in_pos2, in_pos2 + left_30)], red_butt_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_butt_line)
 
-        def creator(file):
-            make_image(file, draw, 400, 300)
+            label_style.render(ctx, "D", in_pos1, RIGHT, BOTTOM, -15, -5)
+            label_style.render(ctx, "E", in_pos2, RIGHT, TOP, -15, 5)
+            label_style.render(ctx, "F", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "Y", gate.label_pos(), CENTER, MIDDLE)
 
-        self.assertTrue(run_image_test('test_or_gate.png', creator))
+        self.assertTrue(run_frame_test('test_or_gate.png', draw, 400, 300, self.references))
 
     def test_xor_gate(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
+            setup(ctx, width, height, background=white)
 
-            gate = Xor((100, 100), 50).fillstyle(Color("yellow")).strokestyle(Color("blue"), 3)
+            gate = Xor((100, 100), 50).fillstyle(yellow).strokestyle(blue_line)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3)
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30), (in_pos2, in_pos2 + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_line)
 
-            Text(ctx).of("A", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("B", in_pos2).size(20).align(RIGHT, TOP).offset(-20, 5).fill(Color(0))
-            Text(ctx).of("C", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("X", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            label_style.render(ctx, "A", in_pos1, RIGHT, BOTTOM, -20, -5)
+            label_style.render(ctx, "B", in_pos2, RIGHT, TOP, -20, 5)
+            label_style.render(ctx, "C", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "X", gate.label_pos(), CENTER, MIDDLE)
 
             gate = Xor((100, 200), 50, invert=True).fillstyle(grey_fill).strokestyle(green_stroke)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos, out_pos + V(50, 0)).stroke(Color("green"), 3)
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30), (in_pos2, in_pos2 + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_50)], green_line)
 
-            Text(ctx).of("D", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("E", in_pos2).size(20).align(RIGHT, TOP).offset(-20, 5).fill(Color(0))
-            Text(ctx).of("F", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("Y", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            label_style.render(ctx, "D", in_pos1, RIGHT, BOTTOM, -20, -5)
+            label_style.render(ctx, "E", in_pos2, RIGHT, TOP, -20, 5)
+            label_style.render(ctx, "F", out_pos, LEFT, BOTTOM, 10, -5)
+            label_style.render(ctx, "Y", gate.label_pos(), CENTER, MIDDLE)
 
-        def creator(file):
-            make_image(file, draw, 400, 300)
-
-        self.assertTrue(run_image_test('test_xor_gate.png', creator))
+        self.assertTrue(run_frame_test('test_xor_gate.png', draw, 400, 300, self.references))
 
 
     def test_box_item(self):
         def draw(ctx, width, height, frame_no, frame_count):
-            setup(ctx, width, height, background=Color(1))
+            setup(ctx, width, height, background=white)
+            labels = TextBatch(ctx, size=20, color=black)
 
-            gate = BoxItem((50, 50), 100).fillstyle(Color("yellow")).strokestyle(Color("blue"), 3)
+            gate = BoxItem((50, 50), 100).fillstyle(yellow).strokestyle(blue_line)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             out_pos = V(gate.get_connector(1, 0))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos, out_pos + V(30, 0)).stroke(Color("green"), 3)
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30), (in_pos2, in_pos2 + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos, out_pos + right_30)], green_line)
 
-            Text(ctx).of("A", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("B", in_pos2).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("C", out_pos).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("X", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
+            labels.add("A", in_pos1, RIGHT, BOTTOM, -20, -5)
+            labels.add("B", in_pos2, RIGHT, BOTTOM, -20, -5)
+            labels.add("C", out_pos, LEFT, BOTTOM, 10, -5)
+            labels.add("X", gate.label_pos(), CENTER, MIDDLE)
+            labels.fill()
 
-            gate = BoxItem((250, 50), 100, height=150, left_connections=3, right_connections=2).fillstyle(Color("white")).strokestyle(Color("black"), 3)
+            gate = BoxItem((250, 50), 100, height=150, left_connections=3, right_connections=2).fillstyle(white).strokestyle(black_line)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             in_pos2 = V(gate.get_connector(0, 1))
             in_pos3 = V(gate.get_connector(0, 2))
             out_pos1 = V(gate.get_connector(1, 0))
             out_pos2 = V(gate.get_connector(1, 1))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("black"), 3)
-            Line(ctx).of_start_end(in_pos2, in_pos2 + V(-30, 0)).stroke(Color("black"), 3)
-            Line(ctx).of_start_end(in_pos3, in_pos3 + V(-30, 0)).stroke(Color("black"), 3)
-            Line(ctx).of_start_end(out_pos1, out_pos1 + V(30, 0)).stroke(Color("black"), 3)
-            Line(ctx).of_start_end(out_pos2, out_pos2 + V(30, 0)).stroke(Color("black"), 3)
-
-            Text(ctx).of("A", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("B", in_pos2).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("Ci", in_pos3).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("S", out_pos1).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("Co", out_pos2).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("Adder", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
-
-            gate = BoxItem((50, 200), 150, left_connections=1, right_connections=2, top_connections=1, bottom_connections=2).fillstyle(Color("yellow")).strokestyle(Color("blue"), 3)
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30),
+                             (in_pos2, in_pos2 + left_30),
+                             (in_pos3, in_pos3 + left_30),
+                             (out_pos1, out_pos1 + right_30),
+                             (out_pos2, out_pos2 + right_30)], black_line)
+
+            labels.add("A", in_pos1, RIGHT, BOTTOM, -20, -5)
+            labels.add("B", in_pos2, RIGHT, BOTTOM, -20, -5)
+            labels.add("Ci", in_pos3, RIGHT, BOTTOM, -20, -5)
+            labels.add("S", out_pos1, LEFT, BOTTOM, 10, -5)
+            labels.add("Co", out_pos2, LEFT, BOTTOM, 10, -5)
+            labels.add("Adder", gate.label_pos(), CENTER, MIDDLE)
+            labels.fill()
+
+            gate = BoxItem((50, 200), 150, left_connections=1, right_connections=2, top_connections=1, bottom_connections=2).fillstyle(yellow).strokestyle(blue_line)
             gate.draw(ctx)
             in_pos1 = V(gate.get_connector(0, 0))
             out_pos1 = V(gate.get_connector(1, 0))
@@ -208,24 +236,18 @@ class TestLogicGatesImages(unittest.TestCase):
             top_pos1 = V(gate.get_connector(2, 0))
             bottom_pos1 = V(gate.get_connector(3, 0))
             bottom_pos2 = V(gate.get_connector(3, 1))
-            Line(ctx).of_start_end(in_pos1, in_pos1 + V(-30, 0)).stroke(Color("blue"), 3)
-            Line(ctx).of_start_end(out_pos1, out_pos1 + V(30, 0)).stroke(Color("green"), 3)
-            Line(ctx).of_start_end(out_pos2, out_pos2 + V(30, 0)).stroke(Color("green"), 3)
-            Line(ctx).of_start_end(top_pos1, top_pos1 + V(0, -30)).stroke(Color("black"), 3)
-            Line(ctx).of_start_end(bottom_pos1, bottom_pos1 + V(0, 30)).stroke(Color("red"), 3)
-            Line(ctx).of_start_end(bottom_pos2, bottom_pos2 + V(0, 30)).stroke(Color("red"), 3)
-
-            Text(ctx).of("Ck", in_pos1).size(20).align(RIGHT, BOTTOM).offset(-20, -5).fill(Color(0))
-            Text(ctx).of("Q", out_pos1).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("Q'", out_pos2).size(20).align(LEFT, BOTTOM).offset(10, -5).fill(Color(0))
-            Text(ctx).of("A", top_pos1).size(20).align(LEFT, BOTTOM).offset(5, -5).fill(Color(0))
-            Text(ctx).of("J", bottom_pos1).size(20).align(LEFT, TOP).offset(5, 5).fill(Color(0))
-            Text(ctx).of("K", bottom_pos2).size(20).align(LEFT, TOP).offset(5, 5).fill(Color(0))
-            Text(ctx).of("X", gate.label_pos()).size(20).align(CENTER, MIDDLE).fill(Color(0))
-
-
-
-        def creator(file):
-            make_image(file, draw, 400, 400)
-
-        self.assertTrue(run_image_test('test_box_item.png', creator))
+            draw_lines(ctx, [(in_pos1, in_pos1 + left_30)], blue_line)
+            draw_lines(ctx, [(out_pos1, out_pos1 + right_30), (out_pos2, out_pos2 + right_30)], green_line)
+            draw_lines(ctx, [(top_pos1, top_pos1 + up_30)], black_line)
+            draw_lines(ctx, [(bottom_pos1, bottom_pos1 + down_30), (bottom_pos2, bottom_pos2 + down_30)], red_line)
+
+            labels.add("Ck", in_pos1, RIGHT, BOTTOM, -20, -5)
+            labels.add("Q", out_pos1, LEFT, BOTTOM, 10, -5)
+            labels.add("Q'", out_pos2, LEFT, BOTTOM, 10, -5)
+            labels.add("A", top_pos1, LEFT, BOTTOM, 5, -5)
+            labels.add("J", bottom_pos1, LEFT, TOP, 5, 5)
+            labels.add("K", bottom_pos2, LEFT, TOP, 5, 5)
+            labels.add("X", gate.label_pos(), CENTER, MIDDLE)
+            labels.fill()
+
+        self.assertTrue(run_frame_test('test_box_item.png', draw, 400, 400, self.references))
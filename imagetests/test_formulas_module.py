@@ -1,11 +1,38 @@
+import os
+import tempfile
 import unittest
+from contextlib import contextmanager
+from pathlib import Path
 
 from generativepy.color import Color
 from generativepy.drawing import make_image
 
-from genpygoodies.formula import make_formulas_png
+from genpygoodies.formula import make_formulas_png, precompile_formulas
 from image_test_helper import run_image_test
 
+red = Color("red")
+black = Color("black")
+cadet_blue = Color("cadetblue")
+multiple_formulas = [r"c^2 = a^2 + b^2", r"\frac{a+b}{c+d} + 3.141592654", r"\frac{a+b}{c+d} + 3.141592654", r"c^2 = a^2 + b^2"]
+
+# The tests must run Latex and draw every image, so make sure the make_formulas_png output cache is off
+os.environ.pop("GENPYGOODIES_FORMULA_OUTPUT_CACHE", None)
+
+
+@contextmanager
+def empty_folder():
+    """
+    Work in an empty temporary folder, so that formulas are never found in a latex_cache left by an earlier test or run
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            yield
+        finally:
+            os.chdir(cwd)
+
+
 """
 Test the formulas module.
 """
@@ -15,7 +42,8 @@ class TestFormulas(unittest.TestCase):
     def test_single_formula(self):
 
         def creator(file):
-            width, height = make_formulas_png(file, [r"x^2"], Color("red"))
+            with empty_folder():
+                width, height = make_formulas_png(file, [r"x^2"], red)
             self.assertEquals(width, 174)
             self.assertEquals(height, 173)
 
@@ -24,9 +52,21 @@ class TestFormulas(unittest.TestCase):
     def test_multiple_formulas(self):
 
         def creator(file):
-            width, height = make_formulas_png(file, [r"c^2 = a^2 + b^2", r"\frac{a+b}{c+d} + 3.141592654", r"\frac{a+b}{c+d} + 3.141592654", r"c^2 = a^2 + b^2"], Color("black"), dpi=300, gap=30, background=Color("cadetblue"))
+            with empty_folder():
+                width, height = make_formulas_png(file, multiple_formulas, black, dpi=300, gap=30, background=cadet_blue)
             self.assertEquals(width, 424)
             self.assertEquals(height, 406)
 
         self.assertTrue(run_image_test('test_multiple_formulas.png', creator))
 
+    def test_precompiled_formulas(self):
+
+        def creator(file):
+            with empty_folder():
+                precompile_formulas([(formula, black, 300, None) for formula in multiple_formulas])
+                self.assertEqual(len(list(Path("latex_cache").glob("*.png"))), 2)
+                width, height = make_formulas_png(file, multiple_formulas, black, dpi=300, gap=30, background=cadet_blue)
+            self.assertEqual(width, 424)
+            self.assertEqual(height, 406)
+
+        self.assertTrue(run_image_test('test_precompiled_formulas.png', creator, ref_name='test_multiple_formulas.png'))
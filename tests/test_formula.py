@@ -0,0 +1,187 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+from generativepy.color import Color
+
+from genpygoodies import formula
+
+red = Color("red")
+blue = Color("blue")
+
+"""
+Test the non-image functions of the formula module: the formula cache, cropping, and precompiling. None of these tests
+run Latex.
+"""
+
+
+def write_page(filename, width, height, box=None):
+    """
+    Write a white RGB page image, like the ones dvipng creates, optionally with a black box (x0, y0, x1, y1) on it
+    """
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    if box is not None:
+        x0, y0, x1, y1 = box
+        page[y0:y1, x0:x1] = 0
+    Image.fromarray(page).save(filename)
+
+
+class TestCropFormula(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.page = os.path.join(self.folder.name, "page1.png")
+        self.out = os.path.join(self.folder.name, "out.png")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_crop(self):
+        write_page(self.page, 50, 40, box=(10, 5, 30, 20))
+        filename, size = formula._crop_formula(self.page, self.out, red)
+        self.assertEqual(filename, self.out)
+        # The size is measured between the first and last pixels of the formula, as generativepy does
+        self.assertEqual(size, (19, 14))
+        with Image.open(self.out) as image:
+            self.assertEqual(image.mode, "RGBA")
+            self.assertEqual(image.size, (20, 15))
+            data = np.asarray(image)
+        self.assertTrue(np.all(data[:, :, 0] == 255))
+        self.assertTrue(np.all(data[:, :, 1:3] == 0))
+        self.assertTrue(np.all(data[:, :, 3] == 255))
+
+    def test_crop_grey_pixels(self):
+        page = np.full((10, 10, 3), 255, dtype=np.uint8)
+        page[4, 3] = 55
+        page[6, 7] = 200
+        Image.fromarray(page).save(self.page)
+        _, size = formula._crop_formula(self.page, self.out, blue)
+        self.assertEqual(size, (4, 2))
+        with Image.open(self.out) as image:
+            data = np.asarray(image)
+        self.assertEqual(data.shape, (3, 5, 4))
+        self.assertEqual(tuple(data[0, 0]), (0, 0, 255, 200))
+        self.assertEqual(tuple(data[2, 4]), (0, 0, 255, 55))
+        self.assertEqual(data[1, 1, 3], 0)
+
+    def test_empty_page(self):
+        write_page(self.page, 50, 40)
+        _, size = formula._crop_formula(self.page, self.out, red)
+        # An empty page isn't cropped, and its size is (rows, columns), as generativepy does
+        self.assertEqual(size, (40, 50))
+        with Image.open(self.out) as image:
+            self.assertEqual(image.size, (50, 40))
+            self.assertTrue(np.all(np.asarray(image)[:, :, 3] == 0))
+
+
+class TestFormulaCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.folder.name) / "latex_cache"
+        self.cache_dir.mkdir()
+        self.image = str(self.cache_dir / "image.png")
+        write_page(self.image, 5, 5)
+        self.key = formula._formula_key(r"x^2", red, 600, ["amssymb"])
+        self.entry = (self.image, (4, 3), os.path.getmtime(self.image))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def save(self, cache):
+        with mock.patch.object(formula, "_FORMULA_CACHES", {self.cache_dir: cache}):
+            formula._save_formula_caches()
+
+    def test_key(self):
+        self.assertEqual(self.key, (r"x^2", red.rgba, 600, ("amssymb",)))
+        self.assertEqual(formula._formula_key(r"x^2", red, 600, None)[3], ())
+
+    def test_round_trip(self):
+        self.save({self.key: self.entry})
+        self.assertEqual(formula._load_formula_cache(self.cache_dir), {self.key: self.entry})
+
+    def test_cache_file_is_json(self):
+        self.save({self.key: self.entry})
+        with open(self.cache_dir / "formulas.json") as cache_file:
+            data = json.load(cache_file)
+        self.assertEqual(data["version"], formula._cache_version())
+        self.assertEqual(len(data["entries"]), 1)
+
+    def test_changed_image_dropped(self):
+        self.save({self.key: self.entry})
+        os.utime(self.image, (self.entry[2] + 10, self.entry[2] + 10))
+        self.assertFalse(formula._is_current(self.entry))
+        self.assertEqual(formula._load_formula_cache(self.cache_dir), {})
+
+    def test_deleted_image_dropped(self):
+        self.save({self.key: self.entry})
+        os.remove(self.image)
+        self.assertFalse(formula._is_current(self.entry))
+        self.assertEqual(formula._load_formula_cache(self.cache_dir), {})
+
+    def test_different_version_ignored(self):
+        self.save({self.key: self.entry})
+        with mock.patch.object(formula, "_CACHE_VERSION", ["other", None, ""]):
+            self.assertEqual(formula._load_formula_cache(self.cache_dir), {})
+
+    def test_invalid_cache_file_ignored(self):
+        for content in ("not json", "[]", '{"version": 1}', "{}"):
+            (self.cache_dir / "formulas.json").write_text(content)
+            self.assertEqual(formula._load_formula_cache(self.cache_dir), {})
+
+    def test_missing_cache_file(self):
+        self.assertEqual(formula._load_formula_cache(self.cache_dir), {})
+
+
+class TestRasterisePages(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        self.keys = [formula._formula_key(r"x^2", red, 600, None), formula._formula_key(r"y^2", blue, 600, None)]
+        self.colors = [red, blue]
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def rasterise(self, page_count, compiled=True):
+        """
+        Call _rasterise_pages with latex and dvipng replaced by a function that writes page_count pages
+        """
+        def dvipng(args, **kwargs):
+            for i in range(page_count):
+                write_page("name{}.png".format(i + 1), 20, 20, box=(2, 2, 10 + i, 12))
+
+        with mock.patch.object(formula, "_compile", return_value=compiled), \
+                mock.patch.object(formula.subprocess, "run", side_effect=dvipng):
+            formula._rasterise_pages("name", self.keys, self.colors, 600, ())
+
+    def test_pages_cached(self):
+        self.rasterise(2)
+        cache = formula._formula_cache()
+        self.assertEqual(cache[self.keys[0]][1], (7, 9))
+        self.assertEqual(cache[self.keys[1]][1], (8, 9))
+        for key in self.keys:
+            self.assertTrue(Path(cache[key][0]).exists())
+        self.assertEqual(sorted(os.listdir(".")), ["latex_cache"])
+
+    def test_too_few_pages(self):
+        self.rasterise(1)
+        self.assertEqual(formula._formula_cache(), {})
+        self.assertEqual(os.listdir("."), [])
+
+    def test_too_many_pages(self):
+        self.rasterise(3)
+        self.assertEqual(formula._formula_cache(), {})
+        self.assertEqual(os.listdir("."), [])
+
+    def test_compile_failed(self):
+        self.rasterise(0, compiled=False)
+        self.assertEqual(formula._formula_cache(), {})